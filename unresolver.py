@@ -2,74 +2,381 @@
 """
 Unresolver: A minimal Python script to find broken links in HTML files.
 Checks <a href>, <link>, <img>, <script>, <iframe>, and <area> tags.
-Uses only standard library for minimal dependencies.
+Uses only standard library for minimal dependencies; lxml is used as a
+faster HTML parser when it is installed.
 """
 
 import argparse
+import collections
+import itertools
 import json
 import os
+import re
+import sqlite3
 import sys
+import threading
+import time
 from html.parser import HTMLParser
 from pathlib import Path
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.parse import urljoin, urlparse, urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
 from urllib.error import URLError, HTTPError
 import socket
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+# Tags and their link attributes to check
+LINK_TAGS = {
+    'a': 'href',
+    'link': 'href',
+    'img': 'src',
+    'script': 'src',
+    'iframe': 'src',
+    'area': 'href',
+}
+
+# Directories skipped when searching for HTML files
+DEFAULT_EXCLUDES = ('.git', 'node_modules', 'venv')
+
+# HTML files are read and parsed this many characters at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+# Links with these schemes, or starting with '#', are skipped rather than checked
+SPECIAL_SCHEMES = frozenset(['mailto', 'tel', 'javascript', 'data'])
+
+# urlparse strips control characters and spaces from the start of a URL and
+# drops tabs and newlines anywhere in it before reading the scheme
+URL_LEADING_STRIP = ''.join(map(chr, range(33)))
+URL_UNSAFE_CHARS = str.maketrans('', '', '\t\r\n')
+
+# Cheap pre-scan for any start tag that could carry a link; files without
+# one never need to go through the HTML parser
+LINK_TAG_RE = re.compile(r'<(?:%s)[\s/>\x00]' % '|'.join(LINK_TAGS), re.IGNORECASE)
+
+# lxml reports a start tag at the line of its closing '>' and caps line
+# numbers at 65535, so files with link tags spanning lines or with more
+# lines than that are parsed with HTMLParser to keep line numbers exact
+MULTILINE_LINK_TAG_RE = re.compile(r'<(?:%s)(?=[\s/\x00])(?:[^>"\']|"[^"]*"|\'[^\']*\')*\n'
+                                   % '|'.join(LINK_TAGS), re.IGNORECASE)
+LXML_MAX_LINE = 65535
+
+# Characters of the previous chunk searched again with the next one, enough
+# for the opening of any realistic link tag split across the boundary
+MULTILINE_TAIL_SIZE = 4096
+
+
+# How long resolved host addresses are reused before resolving again
+DNS_CACHE_TTL = 60  # seconds
+
+_dns_cache = {}
+_dns_locks = {}
+_getaddrinfo = socket.getaddrinfo
+
+
+def cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """Drop-in for socket.getaddrinfo that reuses recent results per host."""
+    key = (host, port, family, type, proto, flags)
+    # Concurrent lookups of the same host wait for the first one to finish
+    with _dns_locks.setdefault(key, threading.Lock()):
+        now = time.monotonic()
+        cached = _dns_cache.get(key)
+        if cached and now - cached[0] < DNS_CACHE_TTL:
+            return list(cached[1])
+        
+        result = _getaddrinfo(host, port, family, type, proto, flags)
+        _dns_cache[key] = (now, result)
+        return list(result)
+
+
+# Headers sent with every external URL check
+REQUEST_HEADERS = {'User-Agent': 'Unresolver/1.0'}
+
+# Redirect handling for external URL checks, matching urllib's defaults
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 10
+
+# Once enough checks have succeeded, the timeout is cut to a multiple of
+# their 95th percentile latency so unresponsive servers fail fast
+LATENCY_SAMPLES = 32
+LATENCY_TIMEOUT_FACTOR = 3
+MIN_TIMEOUT = 1.0  # seconds
+
+# Reachable external URLs are remembered between runs for this long
+CACHE_TTL = 24 * 60 * 60  # seconds
+# Expired entries with an ETag or Last-Modified are kept this long so the
+# URL can be revalidated with a conditional request
+VALIDATOR_TTL = 30 * 24 * 60 * 60  # seconds
+# Expanded by URLCache, so a missing home directory only matters when the
+# cache is actually used
+DEFAULT_CACHE_PATH = '~/.cache/unresolver/urls.sqlite'
+
+# Pause between consecutive checks on the same host to avoid rate limiting
+HOST_DELAY = 0.1  # seconds
+
+
+class Link:
+    """A link found in an HTML file, and the outcome of checking it."""
+    
+    # Large sites have hundreds of thousands of links, so avoid giving
+    # each one a __dict__. Parsers hand back a new string for every tag
+    # name, so extractors intern them to keep one copy per tag.
+    __slots__ = ('tag', 'attr', 'url', 'line', 'status', 'reason')
+    
+    def __init__(self, tag, attr, url, line, status='', reason=''):
+        self.tag = tag
+        self.attr = attr
+        self.url = url
+        self.line = line
+        self.status = status
+        self.reason = reason
+    
+    def to_dict(self):
+        """Return the link as a dict, for JSON output."""
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
 class LinkExtractor(HTMLParser):
     """Extract links from HTML content."""
     
-    # Tags and their link attributes to check
-    LINK_TAGS = {
-        'a': 'href',
-        'link': 'href',
-        'img': 'src',
-        'script': 'src',
-        'iframe': 'src',
-        'area': 'href',
-    }
+    LINK_TAGS = LINK_TAGS
     
     def __init__(self):
         super().__init__()
         self.links = []
+    
+    def reset_links(self):
+        """Discard any partly fed document and its links, ready for the next one."""
+        self.reset()
+        self.links = []
         
     def handle_starttag(self, tag, attrs):
         """Extract links from relevant tags."""
-        if tag in self.LINK_TAGS:
-            attr_name = self.LINK_TAGS[tag]
-            attrs_dict = dict(attrs)
-            if attr_name in attrs_dict:
-                link = attrs_dict[attr_name]
+        attr_name = self.LINK_TAGS.get(tag)
+        if attr_name is None:
+            return
+        
+        # Scan the attribute pairs directly rather than building a dict; as
+        # in browsers, the first of any duplicated attributes wins
+        for name, link in attrs:
+            if name == attr_name:
                 if link:  # Ignore empty links
-                    self.links.append({
-                        'tag': tag,
-                        'attr': attr_name,
-                        'url': link,
-                        'line': self.getpos()[0]
-                    })
+                    self.links.append(Link(sys.intern(tag), attr_name, link, self.getpos()[0]))
+                return
+
+
+# Parsers are reused from one file to the next; each thread (and each
+# worker process) gets its own, as a parser holds the document being fed
+_parsers = threading.local()
+
+
+def _link_parser(use_lxml):
+    """Return this thread's reusable lxml or HTMLParser-based parser."""
+    name = 'lxml' if use_lxml else 'stdlib'
+    parser = getattr(_parsers, name, None)
+    if parser is None:
+        parser = etree.HTMLParser() if use_lxml else LinkExtractor()
+        setattr(_parsers, name, parser)
+    return parser
+
+
+def _extract_links_stdlib(chunks):
+    """Extract links from text chunks with the standard library parser."""
+    parser = _link_parser(use_lxml=False)
+    parser.reset_links()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.links
+
+
+def extract_links(read_chunks):
+    """Extract links from HTML given as a function returning text chunks.
+    
+    Chunks are fed to the parser as they arrive, using lxml's C parser
+    when it is available and its line numbers can be trusted. Otherwise
+    ``read_chunks`` is called again and the text is parsed with HTMLParser.
+    """
+    # Hold chunks back until one could contain a link, so that files
+    # without any never reach the parser. The tail of the previous chunk
+    # catches tags split across a chunk boundary.
+    chunks = iter(read_chunks())
+    pending = []
+    tail = ''
+    for chunk in chunks:
+        pending.append(chunk)
+        if LINK_TAG_RE.search(tail + chunk):
+            break
+        tail = (tail + chunk)[-8:]
+    else:
+        return []
+    
+    if etree is None:
+        return _extract_links_stdlib(itertools.chain(pending, chunks))
+    
+    # Watch for anything that makes lxml's line numbers unreliable while
+    # feeding it, carrying a tail across chunk boundaries so that a link tag
+    # broken over a newline at the edge of a chunk is still seen
+    newlines = 0
+    tail = ''
+    reliable = True
+    parser = _link_parser(use_lxml=True)
+    try:
+        for chunk in itertools.chain(pending, chunks):
+            newlines += chunk.count('\n')
+            if (newlines + 1 >= LXML_MAX_LINE
+                    or MULTILINE_LINK_TAG_RE.search(tail + chunk)):
+                reliable = False
+                break
+            parser.feed(chunk)
+            tail = (tail + chunk)[-MULTILINE_TAIL_SIZE:]
+    except Exception:
+        # Closing drops the partial document so the parser can be reused
+        parser.close()
+        raise
+    
+    if not reliable:
+        if tail:  # Something was fed, so drop the partial document
+            parser.close()
+        # Read the text again rather than keeping a second copy of it
+        return _extract_links_stdlib(read_chunks())
+    
+    root = parser.close()
+    
+    if root is None:  # Empty document
+        return []
+    
+    links = []
+    for element in root.iter(*LINK_TAGS):
+        tag = sys.intern(element.tag)
+        attr_name = LINK_TAGS[tag]
+        link = element.get(attr_name)
+        if link:  # Ignore empty links
+            links.append(Link(tag, attr_name, link, element.sourceline))
+    return links
+
+
+class URLCache:
+    """Persist external URL check results between runs in SQLite."""
+    
+    def __init__(self, path, ttl=CACHE_TTL):
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        # Results are stored from the checker's worker threads
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS urls '
+                '(url TEXT PRIMARY KEY, status INTEGER NOT NULL, ts REAL NOT NULL, '
+                'etag TEXT, last_modified TEXT)'
+            )
+            # Caches written before validators were stored lack the columns
+            columns = {row[1] for row in self._db.execute('PRAGMA table_info(urls)')}
+            for column in ('etag', 'last_modified'):
+                if column not in columns:
+                    self._db.execute(f'ALTER TABLE urls ADD COLUMN {column} TEXT')
+    
+    def load(self):
+        """Return cached URL statuses that have not expired, and validators for those that have.
+        
+        The first dict maps fresh URLs to their HTTP status; the second maps
+        expired URLs to their (etag, last_modified) pair.
+        """
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                'DELETE FROM urls WHERE ts < ? AND '
+                '((etag IS NULL AND last_modified IS NULL) OR ts < ?)',
+                (now - self.ttl, now - VALIDATOR_TTL)
+            )
+            fresh = {}
+            stale = {}
+            for url, status, ts, etag, last_modified in self._db.execute(
+                    'SELECT url, status, ts, etag, last_modified FROM urls'):
+                if ts >= now - self.ttl:
+                    fresh[url] = status
+                else:
+                    stale[url] = (etag, last_modified)
+            return fresh, stale
+    
+    def store(self, url, status, etag=None, last_modified=None):
+        """Record the HTTP status of a checked URL, and its validators if any."""
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO urls (url, status, ts, etag, last_modified) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (url, status, time.time(), etag, last_modified)
+            )
+    
+    def touch(self, url):
+        """Mark a cached URL as checked now, keeping its status and validators."""
+        with self._lock, self._db:
+            self._db.execute('UPDATE urls SET ts = ? WHERE url = ?', (time.time(), url))
 
 
 class LinkChecker:
     """Check if links are valid."""
     
-    def __init__(self, timeout=5, check_external=True, site_root=None, index_files=None):
+    def __init__(self, timeout=5, check_external=True, site_root=None, index_files=None,
+                 workers=50, cache_path=None):
         self.timeout = timeout
         self.check_external = check_external
+        self.workers = workers
         self.checked_urls = {}  # Cache for external URLs
+        self.checked_local = {}  # Cache for local files
+        self._dir_cache = {}  # Directory listings backing local file checks
+        self.cache = None  # Persistent cache for external URLs
+        self._validators = {}  # ETag/Last-Modified of expired cache entries
+        self._latencies = collections.deque(maxlen=256)  # Successful check times
         self.site_root = Path(site_root) if site_root else None
         self.index_files = index_files or ['index.html', 'index.htm']
         
+        # Keep-alive connections are not thread-safe, so each worker thread
+        # keeps its own set, keyed by host
+        self._local = threading.local()
+        # http.client connects directly, so defer to urlopen for URLs that
+        # go through a proxy. getproxies() also reports no_proxy as 'no'.
+        self.proxies = {scheme for scheme in getproxies() if scheme in ('http', 'https')}
+        self._bypass_proxy = {}  # Host -> whether no_proxy exempts it
+        
+        if check_external:
+            # urlopen resolves the host on every request; links on the
+            # same host should only pay for one lookup
+            socket.getaddrinfo = cached_getaddrinfo
+        
+        if check_external and cache_path:
+            try:
+                self.cache = URLCache(cache_path)
+                fresh, self._validators = self.cache.load()
+                for url, status in fresh.items():
+                    self.checked_urls[url] = status < 400
+            # RuntimeError: no home directory to expand ~ against
+            except (sqlite3.Error, OSError, RuntimeError) as e:
+                print(f"Warning: URL cache disabled: {e}", file=sys.stderr)
+                self.cache = None
+        
     def is_external(self, url):
         """Check if URL is external."""
+        # A scheme and a host can only both be present after "scheme://",
+        # so most local links are ruled out without parsing
+        if '://' not in url:
+            return False
         parsed = urlparse(url)
         return bool(parsed.scheme and parsed.netloc)
     
     def is_special_protocol(self, url):
         """Check if URL uses special protocol (mailto, tel, etc.)."""
-        parsed = urlparse(url)
-        special_protocols = ['mailto', 'tel', 'javascript', 'data', '#']
-        return parsed.scheme in special_protocols or url.startswith('#')
+        if url.startswith('#'):
+            return True
+        # Read the scheme the way urlparse does, without parsing the rest
+        scheme, sep, _ = url.lstrip(URL_LEADING_STRIP).partition(':')
+        return bool(sep) and scheme.translate(URL_UNSAFE_CHARS).lower() in SPECIAL_SCHEMES
     
     def check_local_file(self, url, base_path):
         """Check if local file exists."""
@@ -78,6 +385,16 @@ class LinkChecker:
         from urllib.parse import unquote
         url_path = unquote(parsed.path)
         
+        # Pages share navigation and assets, so the same link is seen from
+        # many files; only resolve and check each target once
+        base_dir = Path(base_path).parent
+        if url_path.startswith('/') and self.site_root:
+            key = url_path
+        else:
+            key = (base_dir, url_path)
+        if key in self.checked_local:
+            return self.checked_local[key]
+        
         # Handle absolute vs relative paths
         if url_path.startswith('/'):
             # Absolute path from web root
@@ -86,78 +403,273 @@ class LinkChecker:
                 file_path = self.site_root / url_path.lstrip('/')
             else:
                 # Default behavior: treat as relative to parent directory
-                file_path = Path(base_path).parent / url_path.lstrip('/')
+                file_path = base_dir / url_path.lstrip('/')
         else:
             # Relative path - resolve relative to the HTML file's directory
-            file_path = Path(base_path).parent / url_path
+            file_path = base_dir / url_path
+        
+        result = self._local_path_exists(file_path)
+        self.checked_local[key] = result
+        return result
+    
+    def _dir_entries(self, directory):
+        """Return a directory's entries, mapping each name to whether it is a directory."""
+        entries = self._dir_cache.get(directory)
+        if entries is None:
+            entries = {}
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        # Broken symlinks do not count as existing
+                        if entry.is_symlink() and not os.path.exists(entry.path):
+                            continue
+                        entries[entry.name] = entry.is_dir()
+            except (OSError, ValueError):
+                # Missing or unreadable directories, and paths the OS cannot
+                # represent (such as an embedded NUL byte), have no entries
+                pass
+            self._dir_cache[directory] = entries
+        return entries
+    
+    def _stat_path(self, path):
+        """Return whether a path exists and whether it is a directory."""
+        if path.name in ('', '.', '..'):
+            return path.exists(), path.is_dir()
+        
+        entries = self._dir_entries(path.parent)
+        if path.name in entries:
+            return True, entries[path.name]
+        
+        # Case-insensitive or normalising filesystems (macOS, Windows) can
+        # resolve names that differ from the listing, so ask the OS before
+        # declaring the path missing
+        exists = path.exists()
+        return exists, exists and path.is_dir()
+    
+    def _local_path_exists(self, file_path):
+        """Check if a local path exists, directly or through an index file."""
+        exists, is_dir = self._stat_path(file_path)
         
         # Check if path exists
-        if file_path.exists():
+        if exists:
             return True
         
         # If path is a directory, check for index files
-        if file_path.is_dir():
+        if is_dir:
             for index_file in self.index_files:
-                if (file_path / index_file).exists():
+                if self._stat_path(file_path / index_file)[0]:
                     return True
         
         # If path doesn't have an extension and doesn't exist, try adding index files
-        if not file_path.suffix and not file_path.exists():
+        if not file_path.suffix and not exists:
             for index_file in self.index_files:
-                if (file_path / index_file).exists():
+                if self._stat_path(file_path / index_file)[0]:
                     return True
             
         return False
     
+    def _connection(self, scheme, host, port):
+        """Return this thread's keep-alive connection to a host."""
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        
+        key = (scheme, host, port)
+        if key not in connections:
+            connection_class = HTTPSConnection if scheme == 'https' else HTTPConnection
+            connections[key] = connection_class(host, port, timeout=self.timeout)
+        return connections[key]
+    
+    def _send(self, connection, method, path, timeout, headers):
+        """Send a request on a pooled connection and return the response."""
+        connection.timeout = timeout
+        reused = connection.sock is not None
+        if reused:
+            connection.sock.settimeout(timeout)
+        try:
+            try:
+                connection.request(method, path, headers=headers)
+                return connection.getresponse()
+            except ConnectionError:
+                # The server may have dropped an idle keep-alive connection
+                if not reused:
+                    raise
+                connection.close()
+                connection.request(method, path, headers=headers)
+                return connection.getresponse()
+        except Exception:
+            connection.close()
+            raise
+    
+    def _request(self, method, url, timeout, headers):
+        """Request a URL over pooled connections, following redirects.
+        
+        Returns the final response's status and headers.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            parsed = urlsplit(url)
+            if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+                raise ValueError(f'Unsupported URL: {url}')
+            path = parsed.path or '/'
+            if parsed.query:
+                path += '?' + parsed.query
+            
+            # An explicit port stops http.client from reading the port off
+            # the end of a bare IPv6 address such as ::1
+            port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+            connection = self._connection(parsed.scheme, parsed.hostname, port)
+            response = self._send(connection, method, path, timeout, headers)
+            if method == 'HEAD':
+                response.read()
+            else:
+                # Only the status is needed, so drop the connection rather
+                # than download the body to keep it alive
+                connection.close()
+            
+            location = response.getheader('Location')
+            if response.status in REDIRECT_CODES and location:
+                url = urljoin(url, location)
+                continue
+            return response.status, response.headers
+        
+        raise HTTPException(f'Too many redirects: {url}')
+    
+    def use_proxy(self, url):
+        """Check if a URL has to be requested through a configured proxy."""
+        parsed = urlsplit(url)
+        if parsed.scheme not in self.proxies:
+            return False
+        
+        host = parsed.hostname or ''
+        if host not in self._bypass_proxy:
+            self._bypass_proxy[host] = bool(proxy_bypass(host))
+        return not self._bypass_proxy[host]
+    
+    def effective_timeout(self):
+        """Return the timeout to use for the next external URL check."""
+        latencies = sorted(self._latencies)
+        if len(latencies) < LATENCY_SAMPLES:
+            return self.timeout
+        
+        p95 = latencies[int(len(latencies) * 0.95)]
+        return min(self.timeout, max(MIN_TIMEOUT, LATENCY_TIMEOUT_FACTOR * p95))
+    
     def check_external_url(self, url):
         """Check if external URL is reachable."""
         if url in self.checked_urls:
             return self.checked_urls[url]
         
+        # Revalidate expired cache entries with a conditional request, so an
+        # unchanged resource is confirmed by a bodiless 304
+        headers = REQUEST_HEADERS
+        validators = self._validators.get(url)
+        if validators:
+            etag, last_modified = validators
+            headers = dict(REQUEST_HEADERS)
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        timeout = self.effective_timeout()
+        start = time.monotonic()
         try:
-            # Create request with user agent to avoid blocks
-            req = Request(url, headers={'User-Agent': 'Unresolver/1.0'})
-            response = urlopen(req, timeout=self.timeout)
-            result = response.getcode() < 400
-            self.checked_urls[url] = result
-            return result
-        except (HTTPError, URLError, socket.timeout, OSError, ValueError):
-            self.checked_urls[url] = False
-            return False
+            if self.use_proxy(url):
+                # Create request with user agent to avoid blocks
+                req = Request(url, headers=headers)
+                try:
+                    response = urlopen(req, timeout=timeout)
+                except HTTPError as e:
+                    if e.code != 304:
+                        raise
+                    response = e
+                status, response_headers = response.getcode(), response.headers
+            else:
+                # HEAD skips the response body; fall back to GET for
+                # servers that do not implement it
+                status, response_headers = self._request('HEAD', url, timeout, headers)
+                if status in (405, 501):
+                    status, response_headers = self._request('GET', url, timeout, headers)
+            result = status < 400
+        except (HTTPError, URLError, HTTPException, socket.timeout, OSError, ValueError):
+            result = False
+        
+        if result:
+            self._latencies.append(time.monotonic() - start)
+        
+        # Only reachable URLs are persisted, so broken ones are retried on
+        # the next run instead of being reported from the cache
+        if result and self.cache:
+            if status == 304:
+                self.cache.touch(url)
+            elif status == 200:
+                self.cache.store(url, status, response_headers.get('ETag'),
+                                 response_headers.get('Last-Modified'))
+            else:
+                self.cache.store(url, status)
+        
+        self.checked_urls[url] = result
+        return result
+    
+    def _check_host_urls(self, urls):
+        """Check URLs on a single host one after another."""
+        for i, url in enumerate(urls):
+            if i:
+                time.sleep(HOST_DELAY)
+            self.check_external_url(url)
+    
+    def check_external_urls(self, urls):
+        """Check many external URLs concurrently, filling the URL cache."""
+        pending = sorted(url for url in set(urls) if url not in self.checked_urls)
+        if not pending:
+            return
+        
+        # Hosts are checked in parallel, but each host sees one request at a
+        # time so that sites with many links are not hit with bursts
+        hosts = {}
+        for url in pending:
+            hosts.setdefault(urlsplit(url).netloc.lower(), []).append(url)
+        
+        # Network I/O releases the GIL, so threads overlap the round-trips
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(hosts))) as executor:
+            list(executor.map(self._check_host_urls, hosts.values()))
     
-    def check_link(self, link_info, file_path):
-        """Check if a link is valid."""
-        url = link_info['url']
+    def external_urls(self, links):
+        """Return the URLs among links that need an external check."""
+        return [
+            link.url for link in links
+            if not self.is_special_protocol(link.url) and self.is_external(link.url)
+        ]
+    
+    def check_link(self, link, file_path):
+        """Check if a link is valid, recording the outcome on the link."""
+        url = link.url
         
         # Skip special protocols
         if self.is_special_protocol(url):
-            return {
-                'status': 'skipped',
-                'reason': 'Special protocol or fragment'
-            }
+            link.status = 'skipped'
+            link.reason = 'Special protocol or fragment'
+            return link
         
         # Check external URLs
         if self.is_external(url):
             if not self.check_external:
-                return {
-                    'status': 'skipped',
-                    'reason': 'External URL check disabled'
-                }
+                link.status = 'skipped'
+                link.reason = 'External URL check disabled'
+                return link
             is_valid = self.check_external_url(url)
-            return {
-                'status': 'valid' if is_valid else 'broken',
-                'reason': 'External URL reachable' if is_valid else 'External URL not reachable'
-            }
+            link.status = 'valid' if is_valid else 'broken'
+            link.reason = 'External URL reachable' if is_valid else 'External URL not reachable'
+            return link
         
         # Check local file
         is_valid = self.check_local_file(url, file_path)
-        return {
-            'status': 'valid' if is_valid else 'broken',
-            'reason': 'Local file exists' if is_valid else 'Local file not found'
-        }
+        link.status = 'valid' if is_valid else 'broken'
+        link.reason = 'Local file exists' if is_valid else 'Local file not found'
+        return link
 
 
-def find_html_files(path):
+def find_html_files(path, exclude=DEFAULT_EXCLUDES):
     """Find all HTML files in the given path."""
     path = Path(path)
     if path.is_file():
@@ -165,28 +677,38 @@ def find_html_files(path):
             return [path]
         return []
     
+    # A single walk that reads file names straight from the directory
+    # listings, rather than one recursive glob per extension
+    exclude = set(exclude)
     html_files = []
-    for pattern in ['**/*.html', '**/*.htm']:
-        html_files.extend(path.glob(pattern))
+    for root, dirs, files in os.walk(path):
+        # Prune excluded directories in place so they are never entered, and
+        # sort so that results come out in the same order on every run
+        dirs[:] = sorted(d for d in dirs if d not in exclude)
+        for name in sorted(files):
+            if name.endswith(('.html', '.htm')):
+                html_files.append(Path(root) / name)
     return html_files
 
 
-def check_file(file_path, checker):
-    """Check all links in a single HTML file."""
+def read_html_chunks(file_path):
+    """Yield the text of an HTML file in chunks of READ_CHUNK_SIZE characters."""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        yield from iter(lambda: f.read(READ_CHUNK_SIZE), '')
+
+
+def extract_links_from_file(file_path):
+    """Extract all links from a single HTML file without checking them."""
+    # Stream the file through the parser instead of reading it whole, so
+    # large files are never held in memory twice
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-    except Exception as e:
+        links = extract_links(lambda: read_html_chunks(file_path))
+    except OSError as e:
         return {
             'file': str(file_path),
             'error': f'Failed to read file: {str(e)}',
             'links': []
         }
-    
-    # Extract links
-    parser = LinkExtractor()
-    try:
-        parser.feed(content)
     except Exception as e:
         return {
             'file': str(file_path),
@@ -194,62 +716,130 @@ def check_file(file_path, checker):
             'links': []
         }
     
-    # Check each link
-    results = []
-    for link_info in parser.links:
-        check_result = checker.check_link(link_info, file_path)
-        results.append({
-            **link_info,
-            **check_result
-        })
-    
     return {
         'file': str(file_path),
-        'links': results
+        'links': links
     }
 
 
-def format_text_output(results, show_valid=False):
+def extract_all_links(html_files):
+    """Extract links from HTML files, spreading the parsing across CPU cores.
+    
+    Results are yielded in the order of html_files as they become ready.
+    """
+    workers = os.cpu_count() or 1
+    if workers < 2 or len(html_files) < 2:
+        for file_path in html_files:
+            yield extract_links_from_file(file_path)
+        return
+    
+    # Parsing is CPU-bound, so use processes rather than threads; batch the
+    # files into chunks to amortise the cost of pickling work and results
+    chunksize = max(1, len(html_files) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(extract_links_from_file, html_files, chunksize=chunksize)
+
+
+def check_links(result, checker):
+    """Check the links extracted from a single HTML file."""
+    for link in result['links']:
+        checker.check_link(link, result['file'])
+    return result
+
+
+def check_file(file_path, checker):
+    """Check all links in a single HTML file."""
+    return check_links(extract_links_from_file(file_path), checker)
+
+
+def summarize(results):
+    """Count files, links and broken links, and split each file's links by status.
+    
+    Returns a totals dict and, for each result, a (broken, valid) pair of
+    link lists, all from a single pass over the links.
+    """
+    totals = {'files': len(results), 'links': 0, 'broken': 0}
+    per_file = []
+    for result in results:
+        broken_links = []
+        valid_links = []
+        for link in result['links']:
+            if link.status == 'broken':
+                broken_links.append(link)
+            elif link.status == 'valid':
+                valid_links.append(link)
+        totals['links'] += len(result['links'])
+        totals['broken'] += len(broken_links)
+        per_file.append((broken_links, valid_links))
+    return totals, per_file
+
+
+def format_text_output(results, show_valid=False, summary=None):
     """Format results as text output."""
+    totals, per_file = summary or summarize(results)
     output = []
-    total_files = len(results)
-    total_links = sum(len(r['links']) for r in results)
-    total_broken = sum(len([l for l in r['links'] if l['status'] == 'broken']) for r in results)
     
     output.append(f"\n{'='*70}")
     output.append(f"Link Check Results")
     output.append(f"{'='*70}")
-    output.append(f"Files checked: {total_files}")
-    output.append(f"Total links: {total_links}")
-    output.append(f"Broken links: {total_broken}")
+    output.append(f"Files checked: {totals['files']}")
+    output.append(f"Total links: {totals['links']}")
+    output.append(f"Broken links: {totals['broken']}")
     output.append(f"{'='*70}\n")
     
-    for result in results:
+    for result, (broken_links, valid_links) in zip(results, per_file):
         if 'error' in result:
             output.append(f"\n❌ {result['file']}")
             output.append(f"   Error: {result['error']}")
             continue
         
-        broken_links = [l for l in result['links'] if l['status'] == 'broken']
         if broken_links or show_valid:
             output.append(f"\n📄 {result['file']}")
             
             if broken_links:
                 output.append(f"   ❌ Broken links: {len(broken_links)}")
                 for link in broken_links:
-                    output.append(f"      Line {link['line']}: <{link['tag']} {link['attr']}=\"{link['url']}\">")
-                    output.append(f"      → {link['reason']}")
+                    output.append(f"      Line {link.line}: <{link.tag} {link.attr}=\"{link.url}\">")
+                    output.append(f"      → {link.reason}")
             
-            if show_valid:
-                valid_links = [l for l in result['links'] if l['status'] == 'valid']
-                if valid_links:
-                    output.append(f"   ✓ Valid links: {len(valid_links)}")
-                    for link in valid_links:
-                        output.append(f"      Line {link['line']}: <{link['tag']} {link['attr']}=\"{link['url']}\">")
+            if show_valid and valid_links:
+                output.append(f"   ✓ Valid links: {len(valid_links)}")
+                for link in valid_links:
+                    output.append(f"      Line {link.line}: <{link.tag} {link.attr}=\"{link.url}\">")
     
     return '\n'.join(output)
 
 
+def write_json_output(results, stream):
+    """Write results to stream as a JSON array, one file at a time.
+    
+    The output matches json.dumps(results, indent=2) without ever holding
+    the whole document in memory. Returns the number of broken links.
+    """
+    broken = 0
+    separator = '\n  '
+    stream.write('[')
+    for result in results:
+        # Strings are escaped by json.dumps, so every newline is structural
+        text = json.dumps(result, indent=2, default=Link.to_dict)
+        stream.write(separator + text.replace('\n', '\n  '))
+        separator = ',\n  '
+        broken += sum(link.status == 'broken' for link in result['links'])
+    stream.write(']\n' if separator == '\n  ' else '\n]\n')
+    return broken
+
+
+def positive_int(value):
+    """Parse a command line value that must be a positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, not '{value}'")
+    return number
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -262,13 +852,16 @@ Examples:
   %(prog)s --no-external .        # Skip external URL checks
   %(prog)s --json . > results.json  # Output as JSON
   %(prog)s --site-root /path/to/root .  # Specify site root for absolute URLs
+  %(prog)s --no-cache .           # Re-check every external URL
         """
     )
     parser.add_argument('path', help='Path to HTML file or directory')
     parser.add_argument('--no-external', action='store_true',
                         help='Skip checking external URLs')
     parser.add_argument('--timeout', type=int, default=5,
-                        help='Timeout for external URL checks (seconds, default: 5)')
+                        help='Timeout for external URL checks (seconds, default: 5); '
+                             'shortened to 3x the 95th percentile response time once '
+                             'enough URLs have been checked')
     parser.add_argument('--show-valid', action='store_true',
                         help='Show valid links in addition to broken ones')
     parser.add_argument('--json', action='store_true',
@@ -277,11 +870,22 @@ Examples:
                         help='Site root directory for resolving absolute URLs (starting with /)')
     parser.add_argument('--index-files', type=str, default='index.html,index.htm',
                         help='Comma-separated list of index filenames to check in directories (default: index.html,index.htm)')
+    parser.add_argument('--exclude', type=str, default=','.join(DEFAULT_EXCLUDES),
+                        help='Comma-separated list of directory names to skip when searching for HTML files '
+                             f'(default: {",".join(DEFAULT_EXCLUDES)})')
+    parser.add_argument('--workers', type=positive_int, default=50,
+                        help='Number of hosts to check external URLs on concurrently (default: 50)')
+    parser.add_argument('--cache-path', type=str, default=DEFAULT_CACHE_PATH,
+                        help='SQLite file caching reachable external URLs between runs '
+                             f'(default: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the external URL cache')
     
     args = parser.parse_args()
     
     # Find HTML files
-    html_files = find_html_files(args.path)
+    exclude = [d.strip() for d in args.exclude.split(',') if d.strip()]
+    html_files = find_html_files(args.path, exclude)
     if not html_files:
         print(f"No HTML files found in: {args.path}", file=sys.stderr)
         return 1
@@ -294,22 +898,35 @@ Examples:
         timeout=args.timeout,
         check_external=not args.no_external,
         site_root=args.site_root,
-        index_files=index_files
+        index_files=index_files,
+        workers=args.workers,
+        cache_path=None if args.no_cache else args.cache_path
     )
     
-    results = []
-    for file_path in html_files:
-        result = check_file(file_path, checker)
-        results.append(result)
+    extracted = extract_all_links(html_files)
+    
+    if checker.check_external:
+        # Extract links from every file first so that external URLs can be
+        # checked concurrently before the per-link pass reads them from the cache
+        extracted = list(extracted)
+        external_urls = set()
+        for result in extracted:
+            external_urls.update(checker.external_urls(result['links']))
+        checker.check_external_urls(external_urls)
+    
+    results = (check_links(result, checker) for result in extracted)
     
-    # Output results
+    # Output results; JSON is written as each file is checked, while the
+    # text report needs the totals up front
     if args.json:
-        print(json.dumps(results, indent=2))
+        broken_count = write_json_output(results, sys.stdout)
     else:
-        print(format_text_output(results, args.show_valid))
+        results = list(results)
+        totals, per_file = summarize(results)
+        print(format_text_output(results, args.show_valid, (totals, per_file)))
+        broken_count = totals['broken']
     
     # Return error code if broken links found
-    broken_count = sum(len([l for l in r['links'] if l['status'] == 'broken']) for r in results)
     return 1 if broken_count > 0 else 0
 
 